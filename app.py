@@ -1,6 +1,11 @@
-from flask import Flask, render_template, request, send_file
+from flask import Flask, render_template, request, send_file, abort, jsonify
+from werkzeug.utils import secure_filename
+import io
 import os
-from cv_engine import parse_cv, generate_cv_from_template
+import re
+import shutil
+import time
+from cv_engine import parse_cv, generate_cv_from_template, render_cache_key, RenderCache, pdf_conversion_supported
 
 app = Flask(__name__)
 
@@ -18,6 +23,55 @@ PLANTILLAS = {
     "4": "Plantilla4.docx"
 }
 
+# Descargas: /download/<key>/<filename> NO depende solo de la caché.
+# La caché vive en memoria de cada proceso (no se comparte entre workers ni
+# sobrevive a un reinicio) y descarta renders mayores que su límite, así que
+# cada render se guarda también en OUTPUT_FOLDER/<key>/. /download sirve
+# primero desde la caché y, si no está, desde esa carpeta; la caché solo
+# ahorra la lectura de disco. Los renders en disco se borran pasados
+# OUTPUT_MAX_AGE_SECONDS.
+RENDER_CACHE_MAX_BYTES = int(os.environ.get("RENDER_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+OUTPUT_MAX_AGE_SECONDS = int(os.environ.get("OUTPUT_MAX_AGE_SECONDS", 3600))
+render_cache = RenderCache(max_bytes=RENDER_CACHE_MAX_BYTES)
+
+def render_dir(key):
+    return os.path.join(OUTPUT_FOLDER, secure_filename(key))
+
+def touch_render_dir(key):
+    # Crea la carpeta del render y renueva su mtime para que prune_output no
+    # la borre mientras se escribe o se acaba de servir
+    out_dir = render_dir(key)
+    os.makedirs(out_dir, exist_ok=True)
+    os.utime(out_dir)
+    return out_dir
+
+def prune_output():
+    # Borra renders antiguos de OUTPUT_FOLDER (los recientes siguen siendo
+    # el respaldo de descarga para otros workers)
+    limit = time.time() - OUTPUT_MAX_AGE_SECONDS
+    # Otras peticiones pueden estar podando a la vez: si una entrada ya no
+    # existe se ignora
+    for f in os.listdir(OUTPUT_FOLDER):
+        path = os.path.join(OUTPUT_FOLDER, f)
+        try:
+            if os.path.getmtime(path) >= limit:
+                continue
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            continue
+
+def save_render(key, files):
+    # Asegura que un render servido desde caché también exista en disco
+    out_dir = touch_render_dir(key)
+    for filename, data in files.items():
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
@@ -31,8 +85,7 @@ def index():
         print("📄 Plantilla:", plantilla_id)
 
         # Limpiar output
-        for f in os.listdir(OUTPUT_FOLDER):
-            os.remove(os.path.join(OUTPUT_FOLDER, f))
+        prune_output()
 
         pdf_path = os.path.join(UPLOAD_FOLDER, pdf_file.filename)
         pdf_file.save(pdf_path)
@@ -47,28 +100,76 @@ def index():
         print("✅ CV parseado:")
         print(cv_json)
 
-        print("📝 Generando CV final...")
-        docx_path, pdf_out = generate_cv_from_template(
-            plantilla_path,
-            cv_json,
-            OUTPUT_FOLDER
-        )
+        cache_key = render_cache_key(cv_json, plantilla_path)
+        cached = render_cache.get(cache_key)
+
+        if cached is not None:
+            print("♻️ CV servido desde caché")
+            save_render(cache_key, cached)
+            docx_name = next(n for n in cached if n.endswith(".docx"))
+            pdf_name = next((n for n in cached if n.endswith(".pdf")), None)
+        else:
+            print("📝 Generando CV final...")
+            docx_path, pdf_out = generate_cv_from_template(
+                plantilla_path,
+                cv_json,
+                touch_render_dir(cache_key)
+            )
+
+            files = {}
+            for path in (docx_path, pdf_out):
+                if path:
+                    with open(path, "rb") as f:
+                        files[os.path.basename(path)] = f.read()
+
+            # Si la conversión a PDF falló donde debería funcionar (puede ser
+            # temporal), no se cachea para reintentarla en la próxima petición
+            if pdf_out or not pdf_conversion_supported():
+                render_cache.put(cache_key, files)
+
+            docx_name = os.path.basename(docx_path)
+            pdf_name = os.path.basename(pdf_out) if pdf_out else None
+
+        print("📊 Caché:", render_cache.stats())
 
         return render_template(
             "index.html",
             success=True,
-            docx=os.path.basename(docx_path),
-            pdf=os.path.basename(pdf_out) if pdf_out else None
+            key=cache_key,
+            docx=docx_name,
+            pdf=pdf_name
         )
 
     return render_template("index.html", success=False)
 
-@app.route("/download/<filename>")
-def download(filename):
+@app.route("/download/<key>/<filename>")
+def download(key, filename):
+    data = render_cache.get_file(key, filename)
+    if data is None:
+        # Respaldo en disco (ver comentario junto a render_cache): render
+        # demasiado grande para la caché, expulsado, o generado por otro
+        # proceso. Solo se sirven archivos que existan dentro de
+        # OUTPUT_FOLDER/<key>/, escritos por cualquier worker.
+        if not re.fullmatch(r"[0-9a-f]{64}", key):
+            abort(404)
+        out_dir = render_dir(key)
+        if not os.path.isdir(out_dir) or filename not in os.listdir(out_dir):
+            abort(404)
+        output_root = os.path.realpath(OUTPUT_FOLDER)
+        path = os.path.realpath(os.path.join(out_dir, filename))
+        if not path.startswith(output_root + os.sep) or not os.path.isfile(path):
+            abort(404)
+        return send_file(path, as_attachment=True, download_name=filename)
+
     return send_file(
-        os.path.join(OUTPUT_FOLDER, filename),
-        as_attachment=True
+        io.BytesIO(data),
+        as_attachment=True,
+        download_name=filename
     )
 
+@app.route("/cache/stats")
+def cache_stats():
+    return jsonify(render_cache.stats())
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,14 +1,17 @@
-import pdfplumber
-from docx import Document
-from docx2pdf import convert
 import platform
+import hashlib
+import json
 import re
 import unicodedata
 import shutil
 import os
 import time
 import threading
-import pythoncom
+from collections import OrderedDict
+
+# pdfplumber, python-docx, docx2pdf y pythoncom se importan dentro de las
+# funciones que los usan: así el módulo carga rápido y funciona en Linux,
+# donde pythoncom (pywin32) no existe.
 
 # =========================================================
 # 1. UTILIDADES
@@ -23,6 +26,8 @@ def normalize_text(text):
 
 
 def read_pdf(path):
+    import pdfplumber
+
     blocks = []
     with pdfplumber.open(path) as pdf:
         for page in pdf.pages:
@@ -538,6 +543,11 @@ def replace_placeholders_preserve_style(doc, data, empty_text=""):
                     replace_in_runs(p.runs, data)
 
 
+def pdf_conversion_supported():
+    # docx2pdf necesita Word (COM), solo disponible en Windows
+    return platform.system().lower() == "windows"
+
+
 def generate_cv_from_template(template_path, cv_json, output_dir="output"):
     """
     Genera un DOCX y un PDF desde la plantilla usando docx2pdf.
@@ -565,6 +575,8 @@ def generate_cv_from_template(template_path, cv_json, output_dir="output"):
     # -----------------------------
     # Copiar plantilla y reemplazar placeholders
     # -----------------------------
+    from docx import Document
+
     shutil.copy(template_path, docx_out)
     doc = Document(docx_out)
 
@@ -583,6 +595,9 @@ def generate_cv_from_template(template_path, cv_json, output_dir="output"):
     def convert_pdf_thread():
         nonlocal pdf_generated
         try:
+            import pythoncom
+            from docx2pdf import convert
+
             pythoncom.CoInitialize()  # Inicializar COM en este hilo
             convert(docx_out, pdf_out)
             if os.path.exists(pdf_out):
@@ -590,7 +605,7 @@ def generate_cv_from_template(template_path, cv_json, output_dir="output"):
         except Exception as e:
             print("Error generando PDF en hilo:", e)
 
-    if platform.system().lower() == "windows":
+    if pdf_conversion_supported():
         thread = threading.Thread(target=convert_pdf_thread)
         thread.start()
         thread.join()  # Esperamos a que termine el PDF
@@ -605,4 +620,106 @@ def generate_cv_from_template(template_path, cv_json, output_dir="output"):
     # -----------------------------
     # Devolver DOCX siempre, PDF si se generó
     # -----------------------------
-    return docx_out, pdf_out if pdf_generated else None
\ No newline at end of file
+    return docx_out, pdf_out if pdf_generated else None
+
+
+# =========================================================
+# 6. CACHÉ DE RENDERIZADO
+# =========================================================
+
+# Subir este valor cuando cambie la forma de generar el DOCX/PDF para
+# invalidar los renders guardados con la versión anterior.
+RENDERER_VERSION = "1"
+
+
+def hash_cv_json(cv_json):
+    payload = json.dumps(cv_json, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def render_cache_key(cv_json, template_path):
+    """
+    Clave del render: hash de (CV parseado, archivo de plantilla, versión del
+    renderer). Es un hex apto para URLs, usado también en /download/<key>/...
+    """
+    parts = (hash_cv_json(cv_json), hash_file(template_path), RENDERER_VERSION)
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Caché LRU en memoria de los documentos generados.
+    Guarda los bytes del DOCX y del PDF por clave (hash CV, hash plantilla,
+    versión del renderer) y los expulsa cuando se supera max_bytes.
+    Los renders más grandes que max_bytes no se guardan. La caché es por
+    proceso: no se comparte entre workers ni sobrevive a un reinicio, por lo
+    que no debe ser la única fuente de los archivos servidos.
+    """
+
+    def __init__(self, max_bytes=50 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> {filename: bytes}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Devuelve {filename: bytes} o None, contando hit/miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, files):
+        """Guarda {filename: bytes} para la clave y aplica la expulsión LRU."""
+        entry_size = sum(len(data) for data in files.values())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if entry_size > self.max_bytes:
+                return
+            self._entries[key] = dict(files)
+            self.size += entry_size
+
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_file(self, key, filename):
+        """Devuelve los bytes de un archivo del render o None si ya no está."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or filename not in entry:
+                return None
+            self._entries.move_to_end(key)
+            return entry[filename]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.size -= sum(len(data) for data in entry.values())
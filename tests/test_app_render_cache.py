@@ -0,0 +1,131 @@
+import io
+import os
+import re
+
+import pytest
+
+pytest.importorskip("flask")
+
+import app as cv_app
+from cv_engine import RenderCache
+
+LINK_RE = re.compile(r'/download/([0-9a-f]{64})/([^"]+)"')
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    templates = tmp_path / "templates_docx"
+    templates.mkdir()
+    for name in cv_app.PLANTILLAS.values():
+        (templates / name).write_bytes(name.encode())
+
+    monkeypatch.setattr(cv_app, "UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    monkeypatch.setattr(cv_app, "OUTPUT_FOLDER", str(tmp_path / "output"))
+    monkeypatch.setattr(cv_app, "TEMPLATES_FOLDER", str(templates))
+    os.makedirs(cv_app.UPLOAD_FOLDER)
+    os.makedirs(cv_app.OUTPUT_FOLDER)
+
+    monkeypatch.setattr(cv_app, "render_cache", RenderCache(max_bytes=1024))
+    monkeypatch.setattr(cv_app, "pdf_conversion_supported", lambda: True)
+    monkeypatch.setattr(cv_app, "parse_cv", lambda path: {"nombre": "Ana Perez"})
+
+    calls = []
+
+    def fake_generate(template_path, cv_json, output_dir="output"):
+        calls.append(template_path)
+        docx_out = os.path.join(output_dir, "CV_Ana_Perez_1.docx")
+        pdf_out = os.path.join(output_dir, "CV_Ana_Perez_1.pdf")
+        with open(docx_out, "wb") as f:
+            f.write(b"docx:" + os.path.basename(template_path).encode())
+        if fake_generate.pdf_ok:
+            with open(pdf_out, "wb") as f:
+                f.write(b"pdf")
+            return docx_out, pdf_out
+        return docx_out, None
+
+    fake_generate.pdf_ok = True
+    fake_generate.calls = calls
+    monkeypatch.setattr(cv_app, "generate_cv_from_template", fake_generate)
+
+    cv_app.app.config["TESTING"] = True
+    with cv_app.app.test_client() as c:
+        c.generate = fake_generate
+        yield c
+
+
+def post_cv(client, plantilla="1"):
+    resp = client.post(
+        "/",
+        data={"cv_pdf": (io.BytesIO(b"%PDF-1.4"), "cv.pdf"), "plantilla": plantilla},
+        content_type="multipart/form-data"
+    )
+    assert resp.status_code == 200
+    return dict((name, key) for key, name in LINK_RE.findall(resp.get_data(as_text=True)))
+
+
+def test_repeat_request_is_served_from_cache(client):
+    first = post_cv(client)
+    second = post_cv(client)
+
+    assert len(client.generate.calls) == 1
+    assert first == second
+    assert set(first) == {"CV_Ana_Perez_1.docx", "CV_Ana_Perez_1.pdf"}
+
+
+def test_download_returns_cached_bytes(client):
+    links = post_cv(client)
+    key = links["CV_Ana_Perez_1.docx"]
+
+    # Aunque se borre del disco, la caché sigue sirviendo el archivo
+    os.remove(os.path.join(cv_app.OUTPUT_FOLDER, key, "CV_Ana_Perez_1.docx"))
+    resp = client.get(f"/download/{key}/CV_Ana_Perez_1.docx")
+
+    assert resp.status_code == 200
+    assert resp.data == b"docx:Plantilla1.docx"
+
+
+def test_download_falls_back_to_disk_after_eviction(client):
+    links = post_cv(client)
+    key = links["CV_Ana_Perez_1.pdf"]
+
+    cv_app.render_cache.put("otro", {"x.docx": b"x" * 1024})
+    assert cv_app.render_cache.get_file(key, "CV_Ana_Perez_1.pdf") is None
+
+    resp = client.get(f"/download/{key}/CV_Ana_Perez_1.pdf")
+    assert resp.status_code == 200
+    assert resp.data == b"pdf"
+
+
+def test_download_rejects_unknown_or_invalid_paths(client):
+    links = post_cv(client)
+    key = links["CV_Ana_Perez_1.docx"]
+    with open(os.path.join(cv_app.OUTPUT_FOLDER, "suelto.docx"), "wb") as f:
+        f.write(b"fuera")
+
+    assert client.get(f"/download/{'0' * 64}/CV_Ana_Perez_1.docx").status_code == 404
+    assert client.get(f"/download/{key}/suelto.docx").status_code == 404
+    assert client.get(f"/download/{key}/..%2Fsuelto.docx").status_code == 404
+    assert client.get("/download/../suelto.docx").status_code == 404
+    assert client.get("/download/not-a-key/suelto.docx").status_code == 404
+
+
+def test_failed_pdf_conversion_is_not_cached(client):
+    client.generate.pdf_ok = False
+    links = post_cv(client)
+    assert set(links) == {"CV_Ana_Perez_1.docx"}
+
+    client.generate.pdf_ok = True
+    links = post_cv(client)
+
+    assert len(client.generate.calls) == 2
+    assert "CV_Ana_Perez_1.pdf" in links
+
+
+def test_cache_stats_reports_hits_and_misses(client):
+    post_cv(client)
+    post_cv(client)
+
+    stats = client.get("/cache/stats").get_json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
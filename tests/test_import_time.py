@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Presupuesto de importación en frío de cv_engine (microsegundos, acumulado).
+IMPORT_BUDGET_US = 200_000
+
+HEAVY_MODULES = ["pdfplumber", "docx", "docx2pdf", "pythoncom"]
+
+
+@pytest.fixture(scope="module")
+def import_result():
+    # Una sola importación en frío; ambas comprobaciones usan la misma medida
+    code = (
+        "import sys, cv_engine; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        check=True
+    )
+
+
+def cumulative_us(stderr, module):
+    # Formato: "import time: self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise AssertionError(f"{module} no aparece en la salida de -X importtime")
+
+
+def test_import_does_not_load_heavy_backends(import_result):
+    assert import_result.stdout.strip() == ""
+
+
+def test_import_time_under_budget(import_result):
+    assert cumulative_us(import_result.stderr, "cv_engine") < IMPORT_BUDGET_US
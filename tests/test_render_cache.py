@@ -0,0 +1,102 @@
+import pytest
+
+import cv_engine
+from cv_engine import RenderCache, render_cache_key, RENDERER_VERSION
+
+
+CV = {"nombre": "Ana Perez", "skills": ["Python", "SQL"]}
+
+
+@pytest.fixture
+def plantilla(tmp_path):
+    path = tmp_path / "Plantilla.docx"
+    path.write_bytes(b"plantilla-1")
+    return path
+
+
+def test_key_is_stable_and_url_safe(plantilla):
+    key = render_cache_key(CV, plantilla)
+    assert key == render_cache_key(dict(reversed(list(CV.items()))), plantilla)
+    assert len(key) == 64 and all(c in "0123456789abcdef" for c in key)
+
+
+def test_key_changes_with_cv_template_and_version(plantilla, tmp_path, monkeypatch):
+    key = render_cache_key(CV, plantilla)
+
+    assert render_cache_key({**CV, "nombre": "Otro"}, plantilla) != key
+
+    otra = tmp_path / "Otra.docx"
+    otra.write_bytes(b"plantilla-2")
+    assert render_cache_key(CV, otra) != key
+
+    monkeypatch.setattr(cv_engine, "RENDERER_VERSION", RENDERER_VERSION + "x")
+    assert render_cache_key(CV, plantilla) != key
+
+
+def test_get_counts_hits_and_misses():
+    cache = RenderCache(max_bytes=100)
+    assert cache.get("a") is None
+    cache.put("a", {"a.docx": b"123"})
+    assert cache.get("a") == {"a.docx": b"123"}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_lru_eviction_order():
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", {"a.docx": b"1234"})
+    cache.put("b", {"b.docx": b"1234"})
+    cache.get("a")  # "b" pasa a ser el menos usado
+    cache.put("c", {"c.docx": b"1234"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 8
+
+
+def test_get_file_refreshes_lru_order():
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", {"a.docx": b"1234"})
+    cache.put("b", {"b.docx": b"1234"})
+    assert cache.get_file("a", "a.docx") == b"1234"
+    cache.put("c", {"c.docx": b"1234"})
+
+    assert cache.get_file("b", "b.docx") is None
+    assert cache.get_file("a", "a.docx") == b"1234"
+
+
+def test_replace_updates_size():
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", {"a.docx": b"12345", "a.pdf": b"123"})
+    assert cache.stats()["size_bytes"] == 8
+    cache.put("a", {"a.docx": b"12"})
+
+    assert cache.stats()["size_bytes"] == 2
+    assert cache.stats()["entries"] == 1
+    assert cache.get_file("a", "a.pdf") is None
+
+
+def test_oversize_render_is_not_cached():
+    cache = RenderCache(max_bytes=10)
+    cache.put("small", {"s.docx": b"123"})
+    cache.put("big", {"z.docx": b"1" * 20})
+
+    assert cache.get_file("big", "z.docx") is None
+    assert cache.get_file("small", "s.docx") == b"123"
+    assert cache.stats()["size_bytes"] == 3
+    assert cache.stats()["evictions"] == 0
+
+
+def test_get_file_is_scoped_to_key():
+    # Mismo nombre de archivo en dos renders distintos (misma persona y segundo)
+    cache = RenderCache(max_bytes=100)
+    cache.put("k1", {"CV_Ana_1.docx": b"plantilla1"})
+    cache.put("k2", {"CV_Ana_1.docx": b"plantilla2"})
+
+    assert cache.get_file("k1", "CV_Ana_1.docx") == b"plantilla1"
+    assert cache.get_file("k2", "CV_Ana_1.docx") == b"plantilla2"
+    assert cache.get_file("k1", "otro.docx") is None
+    assert cache.get_file("nope", "CV_Ana_1.docx") is None